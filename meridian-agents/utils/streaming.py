@@ -3,6 +3,7 @@ Streaming utilities for agent execution.
 Provides event emission and formatting for SSE.
 """
 import datetime
+from functools import lru_cache
 from typing import Dict, Any, Optional, Callable, AsyncGenerator
 from collections import deque
 
@@ -97,9 +98,10 @@ AGENT_NAME_MAP = {
 }
 
 
+@lru_cache(maxsize=None)
 def get_agent_name(node_name: str) -> str:
     """Get human-readable agent name from graph node name."""
-    return AGENT_NAME_MAP.get(node_name, node_name.replace("_", " ").title())
+    return AGENT_NAME_MAP.get(node_name) or node_name.replace("_", " ").title()
 
 
 def detect_agent_from_state(state: Dict[str, Any]) -> Optional[str]:
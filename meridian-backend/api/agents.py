@@ -4,16 +4,63 @@ Agents service API endpoints.
 import os
 import logging
 from typing import Optional, List
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, Field
 import httpx
 from fastapi.responses import Response
 from utils.pdf_generator import generate_analysis_pdf
 
+# Try to import orjson for faster decoding of large agent responses
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/agents", tags=["agents"])
 
+def create_agents_client() -> httpx.AsyncClient:
+    """
+    Create the shared agents service HTTP client, so requests reuse keep-alive connections.
+    Created and closed by the app's lifespan handler and stored on app.state.
+    """
+    return httpx.AsyncClient(
+        timeout=300.0,
+        limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=75.0)
+    )
+
+
+def get_agents_client(http_request: Request) -> httpx.AsyncClient:
+    """Shared agents service HTTP client for the running app."""
+    return http_request.app.state.agents_client
+
+
+def _decode_json(response: httpx.Response):
+    """Decode a JSON response body, using orjson when available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _format_http_error(e: httpx.HTTPStatusError) -> str:
+    """Build the error detail for a failed agents service response."""
+    try:
+        error_body = _decode_json(e.response)
+        if "detail" in error_body:
+            return f"Agents service error: {error_body['detail']}"
+    except (ValueError, TypeError):
+        return f"Agents service error: {e.response.text or str(e)}"
+    return f"Agents service error: {e.response.status_code}"
+
+
+def _json_body(payload: dict) -> dict:
+    """Build httpx request kwargs for a JSON body, serialized with orjson when available."""
+    if ORJSON_AVAILABLE:
+        return {"content": orjson.dumps(payload), "headers": {"Content-Type": "application/json"}}
+    return {"json": payload}
+
 
 class ConversationMessage(BaseModel):
     """Message in conversation context for agents analysis."""
@@ -40,7 +87,10 @@ class AgentAnalyzeResponse(BaseModel):
 
 
 @router.post("/analyze", response_model=AgentAnalyzeResponse)
-async def agents_analyze(request: AgentAnalyzeRequest):
+async def agents_analyze(
+    request: AgentAnalyzeRequest,
+    agents_client: httpx.AsyncClient = Depends(get_agents_client)
+):
     """
     Analyze a company using the agents service.
     Proxies request to agents service at AGENTS_SERVICE_URL/analyze
@@ -79,22 +129,13 @@ async def agents_analyze(request: AgentAnalyzeRequest):
         ]
     
     try:
-        async with httpx.AsyncClient(timeout=300.0) as client:
-            response = await client.post(analyze_endpoint, json=payload)
-            response.raise_for_status()
-            return response.json()
+        response = await agents_client.post(analyze_endpoint, timeout=300.0, **_json_body(payload))
+        response.raise_for_status()
+        return _decode_json(response)
     except httpx.HTTPStatusError as e:
-        error_detail = f"Agents service error: {e.response.status_code}"
-        try:
-            error_body = e.response.json()
-            if "detail" in error_body:
-                error_detail = f"Agents service error: {error_body['detail']}"
-        except:
-            error_detail = f"Agents service error: {e.response.text or str(e)}"
-        
         raise HTTPException(
             status_code=e.response.status_code if e.response.status_code < 500 else 502,
-            detail=error_detail
+            detail=_format_http_error(e)
         )
     except httpx.RequestError as e:
         raise HTTPException(
@@ -186,7 +227,7 @@ async def download_pdf(filename: str):
 
 
 @router.get("/health")
-async def agents_health():
+async def agents_health(agents_client: httpx.AsyncClient = Depends(get_agents_client)):
     """
     Agents health check endpoint.
     Returns status for agent backend.
@@ -196,15 +237,14 @@ async def agents_health():
     health_endpoint = f"{agents_url}/health"
     
     try:
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            response = await client.get(health_endpoint)
-            response.raise_for_status()
-            data = response.json()
-            return {
-                "status": "ok", 
-                "agent_service": data,
-                "agents_url": agents_url
-            }
+        response = await agents_client.get(health_endpoint, timeout=5.0)
+        response.raise_for_status()
+        data = _decode_json(response)
+        return {
+            "status": "ok", 
+            "agent_service": data,
+            "agents_url": agents_url
+        }
     except httpx.ConnectError as e:
         return {
             "status": "error",
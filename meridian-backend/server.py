@@ -2,6 +2,7 @@
 Meridian Backend API Server
 FastAPI application with modular API structure.
 """
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
@@ -26,8 +27,19 @@ logging.basicConfig(
 )
 logger = logging.getLogger("meridian_backend")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create shared outbound HTTP clients on startup and close them on shutdown."""
+    app.state.agents_client = agents.create_agents_client()
+    try:
+        yield
+    finally:
+        await app.state.agents_client.aclose()
+
+
 # Create FastAPI app
-app = FastAPI(title="Meridian Backend API", version="1.0.0")
+app = FastAPI(title="Meridian Backend API", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -57,6 +57,10 @@ class AgentOrchestrator:
             Tuple of (QueryIntent, AgentWorkflowConfig)
         """
         intent = self.classifier.classify(query, conversation_context)
+        return intent, self._get_workflow_for_intent(query, intent)
+
+    def _get_workflow_for_intent(self, query: str, intent: QueryIntent) -> AgentWorkflowConfig:
+        """Map a classified query to its optimized workflow configuration."""
         base_workflow = self.workflow_mapper.get_workflow_config(intent)
 
         # Optimize workflow based on query content analysis
@@ -69,7 +73,29 @@ class AgentOrchestrator:
             f"agents={optimized_workflow.agents}"
         )
 
-        return intent, optimized_workflow
+        return optimized_workflow
+
+    def classify_and_get_workflow_batch(
+        self,
+        queries: List[str],
+        conversation_context: Optional[list] = None
+    ) -> List[Tuple[QueryIntent, AgentWorkflowConfig]]:
+        """
+        Classify several queries and get their workflow configurations.
+
+        Args:
+            queries: User query texts
+            conversation_context: Optional conversation history shared by all queries
+
+        Returns:
+            List of (QueryIntent, AgentWorkflowConfig) tuples, in the same order as queries
+        """
+        # Context-dependent classifications can't share a prompt; classify them one by one
+        if conversation_context:
+            return [self.classify_and_get_workflow(query, conversation_context) for query in queries]
+
+        intents = self.classifier.classify_batch(queries)
+        return [(intent, self._get_workflow_for_intent(query, intent)) for query, intent in zip(queries, intents)]
 
     def analyze_query_for_agents(self, query: str, intent: QueryIntent) -> List[str]:
         """
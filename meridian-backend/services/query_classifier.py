@@ -28,11 +28,23 @@ try:
         requires_agents: bool = Field(description="Whether this needs agent workflows")
         complexity: str = Field(description="simple|medium|complex query complexity")
 
+    class BatchQueryClassification(BaseModel):
+        """Structured classification response for a numbered batch of queries."""
+
+        classifications: List[QueryClassification] = Field(
+            description="One classification per query, in the same order as the numbered queries"
+        )
+
 except (ImportError, PermissionError) as e:
     INSTRUCTOR_AVAILABLE = False
     logger.error(f"Instructor library not available: {e}. LLM classification requires instructor.")
     raise RuntimeError(f"LLM classification requires instructor library. Install with: pip install instructor")
 
+# Batch classification limits: larger batches are split, and batches whose combined
+# query text exceeds the character budget are classified one query at a time
+MAX_BATCH_QUERIES = 20
+MAX_BATCH_CHARS = 8000
+
 
 class QueryClassifier:
     """Classifies user queries using LLM with Instructor structured outputs."""
@@ -113,11 +125,55 @@ class QueryClassifier:
             logger.error(f"LLM classification with entities failed for query '{query[:50]}...': {e}")
             return None
 
+    def classify_batch(self, queries: List[str]) -> List[QueryIntent]:
+        """
+        Classify several independent queries with as few LLM calls as possible.
+
+        Args:
+            queries: User query texts, classified without conversation context
+
+        Returns:
+            List of QueryIntent values in the same order as queries
+
+        Raises:
+            RuntimeError: If classification fails
+        """
+        intents: Dict[int, QueryIntent] = {}
+        pending: List[int] = []
+        for i, query in enumerate(queries):
+            if not query or not query.strip():
+                intents[i] = QueryIntent.SIMPLE_CHAT
+                continue
+            cached = self.classification_cache.get(self._cache_key(query))
+            if cached is not None:
+                intents[i] = cached.intent
+            else:
+                pending.append(i)
+
+        for start in range(0, len(pending), MAX_BATCH_QUERIES):
+            chunk = pending[start:start + MAX_BATCH_QUERIES]
+            batch = [queries[i] for i in chunk]
+            if len(batch) == 1 or sum(len(query) for query in batch) > MAX_BATCH_CHARS:
+                for i in chunk:
+                    intents[i] = self.classify(queries[i])
+                continue
+
+            for i, classification in zip(chunk, self._classify_batch_with_llm(batch)):
+                self.classification_cache[self._cache_key(queries[i])] = classification
+                intents[i] = classification.intent
+
+        return [intents[i] for i in range(len(queries))]
+
+    @staticmethod
+    def _cache_key(query: str, context: Optional[List[dict]] = None) -> str:
+        """Classification cache key, shared by the single-query and batch paths."""
+        return f"{query}_{hash(str(context)) if context else ''}"
+
     def _classify_with_llm(self, query: str, context: Optional[List[dict]] = None) -> Optional[QueryClassification]:
         """Classify using LLM with structured output."""
 
         # Check cache first
-        cache_key = f"{query}_{hash(str(context)) if context else ''}"
+        cache_key = self._cache_key(query, context)
         if cache_key in self.classification_cache:
             return self.classification_cache[cache_key]
 
@@ -154,6 +210,42 @@ class QueryClassifier:
             logger.error(f"LLM classification error: {e}")
             return None
     
+    def _classify_batch_with_llm(self, queries: List[str]) -> List[QueryClassification]:
+        """Classify a numbered list of queries with one structured LLM call."""
+        numbered_queries = "\n".join(f"{i}. {' '.join(query.split())}" for i, query in enumerate(queries, 1))
+
+        # Same system prompt as single-query calls, so the shared prefix can be cached
+        messages = [
+            {"role": "system", "content": self._build_classification_prompt()},
+            {
+                "role": "system",
+                "content": (
+                    "Classify each of the following numbered queries independently. "
+                    "Return exactly one classification per query, in the same order."
+                )
+            },
+            {"role": "user", "content": numbered_queries}
+        ]
+
+        try:
+            response = self.client.chat.completions.create(
+                model=self.model,
+                messages=messages,
+                response_model=BatchQueryClassification,
+                max_retries=2,
+                temperature=0.1
+            )
+        except Exception as e:
+            logger.error(f"LLM batch classification error: {e}")
+            raise RuntimeError(f"Batch query classification failed: {e}")
+
+        if len(response.classifications) != len(queries):
+            raise RuntimeError(
+                f"Batch query classification returned {len(response.classifications)} results "
+                f"for {len(queries)} queries"
+            )
+        return response.classifications
+
     def _build_classification_prompt(self) -> str:
         """Build system prompt with examples and instructions."""
         return """
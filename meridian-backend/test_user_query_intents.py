@@ -4,12 +4,20 @@ Tests intent detection for user queries with category-based testing.
 """
 
 import argparse
+import asyncio
+import hashlib
 import json
 import logging
 import os
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from functools import cached_property, partial
+from types import MappingProxyType
+from typing import List, Dict, Any, Mapping, Optional, Tuple, BinaryIO
 from dataclasses import dataclass, field
 
 # Add backend to path for imports
@@ -19,58 +27,498 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Import intent classification (with fallback if not available)
+# Intent classification is imported lazily on first use (None = not yet resolved),
+# so generating or listing test queries doesn't load the agent orchestrator graph
+INTENT_CLASSIFICATION_AVAILABLE: Optional[bool] = None
+get_agent_orchestrator = None
+
+# Use orjson for results serialization when available
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Use uvloop as the event loop when available
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+# Show a single aggregated progress bar when tqdm is installed
+try:
+    from tqdm import tqdm
+    TQDM_AVAILABLE = True
+except ImportError:
+    TQDM_AVAILABLE = False
+
+# Try to import cachetools for a bounded, expiring in-memory classification cache
+try:
+    from cachetools import TTLCache
+    CACHETOOLS_AVAILABLE = True
+except ImportError:
+    CACHETOOLS_AVAILABLE = False
+
+# Try to import diskcache so classifications persist across test runs
 try:
-    from services.query_classifier import get_query_classifier
-    from services.agent_orchestrator import get_agent_orchestrator
-    from models.query_intent import QueryIntent
-    INTENT_CLASSIFICATION_AVAILABLE = True
-    logger.info("Instructor-based intent classification available")
-except (ImportError, RuntimeError) as e:
-    logger.warning(f"Intent classification not available: {e}")
-    INTENT_CLASSIFICATION_AVAILABLE = False
-
-@dataclass
+    import diskcache
+    DISKCACHE_AVAILABLE = True
+except ImportError:
+    DISKCACHE_AVAILABLE = False
+
+# Classification cache limits (entries expire after a day in memory and on disk)
+INTENT_CACHE_MAX_ENTRIES = 1000
+INTENT_CACHE_TTL_SECONDS = 86400
+
+INTENT_CACHE_DIR = os.path.join(tempfile.gettempdir(), "meridian_intent_cache")
+
+# Batch classification attempts, with exponential backoff between them. Only transient
+# provider failures are retried; the classifier's instructor client already retries
+# each call twice, so single-query classification makes one attempt
+CLASSIFY_MAX_ATTEMPTS = 2
+CLASSIFY_RETRY_BASE_DELAY = 0.5
+
+# Expected, retryable failures; logged in one line without a traceback. The provider's
+# connection, timeout and rate-limit errors are added once the classifier is imported
+_TRANSIENT_ERRORS: Tuple[type, ...] = (TimeoutError, ConnectionError)
+
+# Maximum number of classification calls in flight at once
+# (override with MERIDIAN_TEST_CONCURRENCY to match the provider's rate limit)
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("MERIDIAN_TEST_CONCURRENCY", "8"))
+
+# Shared, read-only result for every query when classification can't be imported;
+# the error is logged once rather than once per query
+_UNAVAILABLE_RESULT = MappingProxyType({
+    "intent": "error",
+    "error": "Instructor-based classification is required but not available",
+    "classification_method": "failed"
+})
+_unavailable_warned = False
+
+
+def _ensure_intent_imports() -> bool:
+    """Import intent classification on first call and report whether it is available."""
+    global INTENT_CLASSIFICATION_AVAILABLE, get_agent_orchestrator, _TRANSIENT_ERRORS
+    if INTENT_CLASSIFICATION_AVAILABLE is not None:
+        return INTENT_CLASSIFICATION_AVAILABLE
+
+    try:
+        from services.agent_orchestrator import get_agent_orchestrator as _get_agent_orchestrator
+        import openai
+        get_agent_orchestrator = _get_agent_orchestrator
+        _TRANSIENT_ERRORS += (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+        INTENT_CLASSIFICATION_AVAILABLE = True
+        logger.info("Instructor-based intent classification available")
+    except (ImportError, RuntimeError) as e:
+        logger.warning(f"Intent classification not available: {e}")
+        INTENT_CLASSIFICATION_AVAILABLE = False
+    return INTENT_CLASSIFICATION_AVAILABLE
+
+
+# Results hold only JSON-native values (timestamps are pre-formatted strings) apart
+# from the shared read-only _UNAVAILABLE_RESULT, which the default= hook unwraps
+def _json_default(obj: Any) -> Any:
+    """Serialize read-only mappings as plain objects."""
+    if isinstance(obj, MappingProxyType):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _json_line(obj: Any) -> bytes:
+    """Serialize an object as a single newline-terminated JSON record."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(
+            obj, default=_json_default, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        )
+    return (json.dumps(obj, default=_json_default) + "\n").encode("utf-8")
+
+
+def _json_pretty(obj: Any) -> bytes:
+    """Serialize an object as indented JSON."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=_json_default, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, indent=2, default=_json_default).encode("utf-8")
+
+
+def _summarize_classification(intent: Any, workflow: Any) -> Tuple[str, str, Tuple[str, ...], int]:
+    """Reduce an orchestrator (intent, workflow) pair to a hashable summary tuple."""
+    return (
+        intent.value if hasattr(intent, 'value') else str(intent),
+        workflow.workflow_type,
+        tuple(workflow.agents),
+        workflow.timeout_seconds
+    )
+
+
+def _classification_result(intent: str, workflow_type: str, agents: Tuple[str, ...], timeout_seconds: int) -> Dict[str, Any]:
+    """Build the per-query classification result dict."""
+    return {
+        "intent": intent,
+        "workflow_type": workflow_type,
+        "agents": list(agents),
+        "timeout_seconds": timeout_seconds,
+        "classification_method": "instructor_llm"
+    }
+
+
+def _resolve_batch(futures: List[asyncio.Future], batch: asyncio.Future) -> None:
+    """Resolve per-query futures from a finished batch classification."""
+    if batch.cancelled():
+        for future in futures:
+            future.cancel()
+    elif batch.exception() is not None:
+        for future in futures:
+            future.set_exception(batch.exception())
+    else:
+        for future, result in zip(futures, batch.result()):
+            future.set_result(result)
+
+
+def _is_transient_error(exc: BaseException) -> bool:
+    """
+    Whether a classification failure, or an error it was raised from or while handling,
+    is a timeout, connection or rate-limit error. The classifier reports failures as
+    RuntimeError, so provider errors are only visible through the exception chain; batch
+    classification keeps them there, while single-query classification logs and drops them.
+    """
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        if isinstance(exc, _TRANSIENT_ERRORS):
+            return True
+        seen.add(id(exc))
+        exc = exc.__cause__ or exc.__context__
+    return False
+
+
+def _normalize_query(query: str) -> str:
+    """Cache/coalescing key for a query: case- and surrounding-whitespace-insensitive."""
+    return query.strip().lower()
+
+
+def _intent_cache_key(classifier_fingerprint: str, query: str) -> str:
+    """Exact-match cache key: SHA-256 of the classifier fingerprint and the normalized query."""
+    return hashlib.sha256(f"{classifier_fingerprint}\n{_normalize_query(query)}".encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
 class TestThread:
     """Represents a test category with multiple queries."""
-    queries: List[str]
+    queries: Tuple[str, ...]
+    expected_intent: str  # Expected intent for every query unless overridden
     description: str
     category: str  # Category name for filtering
-    expected_intents: List[str]  # Expected intent for each query
+    expected_overrides: Mapping[int, str] = field(default_factory=dict)  # Query index -> expected intent
+
+    def __post_init__(self):
+        # Keep a read-only copy, so shared instances can't be changed through the caller's dict
+        object.__setattr__(self, "expected_overrides", MappingProxyType(dict(self.expected_overrides)))
+
+    def expected_intent_for(self, index: int) -> str:
+        """Expected intent for the query at the given index."""
+        return self.expected_overrides.get(index, self.expected_intent)
+
+
+# Test categories, built once at import (TestThread is immutable, so instances are shared)
+_TEST_THREADS: Tuple[TestThread, ...] = (
+    # Category: simple_chat - No agents, direct OpenAI responses
+    TestThread(
+        queries=(
+            "Hello! What are you?",
+            "What can you help me with?",
+            "Tell me about yourself",
+            "What is Meridian?",
+            "How can you help me with investing?"
+        ),
+        expected_intent="simple_chat",
+        description="Simple chat - no agents",
+        category="simple_chat"
+    ),
+
+    # Category: basic_info - Single agent (information)
+    TestThread(
+        queries=(
+            "What is Apple stock trading at today?",
+            "What is Tesla's business?",
+            "What's Microsoft's main products?",
+            "What is NVIDIA doing?",
+            "What's Amazon's business model?"
+        ),
+        expected_intent="basic_info",
+        description="Basic info - information agent",
+        category="basic_info"
+    ),
+
+    # Category: technical_analysis - Single agent (market)
+    TestThread(
+        queries=(
+            "Run a market analysis on AAPL",
+            "Apple stock technical analysis",
+            "What's the technical outlook for Tesla?",
+            "Show me technical indicators for Microsoft",
+            "Technical chart analysis for NVIDIA"
+        ),
+        expected_intent="technical_analysis",
+        description="Technical analysis - market agent",
+        category="technical_analysis"
+    ),
+
+    # Category: fundamental_analysis - Single agent (fundamentals)
+    TestThread(
+        queries=(
+            "Analyze Apple's fundamentals",
+            "Get fundamental data for Apple",
+            "Tesla's financial health",
+            "Microsoft's financial metrics",
+            "NVIDIA's valuation analysis"
+        ),
+        expected_intent="fundamental_analysis",
+        description="Fundamental analysis - fundamentals agent",
+        category="fundamental_analysis"
+    ),
+
+    # Category: market_overview - Multi-agent (market + information)
+    TestThread(
+        queries=(
+            "What are the major stock indices?",
+            "What's the Dow Jones?",
+            "Explain S&P 500",
+            "What's NASDAQ?",
+            "How do stock indices work?"
+        ),
+        expected_intent="market_overview",
+        description="Market overview - market and information agents",
+        category="market_overview"
+    ),
+
+    # Category: comprehensive_analysis - Full workflow (multiple agents)
+    TestThread(
+        queries=(
+            "Should I buy Apple stock today?",
+            "Is Tesla overvalued?",
+            "Bull case for Tesla",
+            "Risk assessment for Microsoft",
+            "Comprehensive analysis of AMZN"
+        ),
+        expected_intent="comprehensive_trade",
+        description="Comprehensive analysis - full workflow",
+        category="comprehensive_analysis"
+    ),
+
+    # Category: investment_analysis - Broad investment queries that should trigger full workflow
+    TestThread(
+        queries=(
+            "Is Apple a good investment?",
+            "Should I invest in Tesla?",
+            "Analyze Microsoft stock for me",
+            "Evaluate NVIDIA as an investment",
+            "What do you think about Amazon stock?",
+            "Is Google worth buying?",
+            "Meta investment opportunity",
+            "Long-term potential of Apple",
+            "Risk analysis for Tesla",
+            "Investment recommendation for Microsoft"
+        ),
+        expected_intent="comprehensive_trade",
+        description="Broad investment analysis - should trigger comprehensive workflow",
+        category="investment_analysis"
+    ),
+
+    # Category: news_sentiment - News and sentiment analysis
+    TestThread(
+        queries=(
+            "What's the news on Apple today?",
+            "Tesla social media sentiment",
+            "Microsoft recent announcements",
+            "Market sentiment for NVIDIA",
+            "Breaking news in tech stocks"
+        ),
+        expected_intent="news_sentiment",
+        description="News and sentiment analysis",
+        category="news_sentiment"
+    ),
+
+    # Category: portfolio_review - Portfolio analysis
+    TestThread(
+        queries=(
+            "How is my portfolio performing?",
+            "Review my investments",
+            "Portfolio allocation analysis",
+            "Should I rebalance my portfolio?",
+            "Portfolio risk assessment"
+        ),
+        expected_intent="portfolio_review",
+        description="Portfolio analysis and review",
+        category="portfolio_review"
+    ),
+
+    # Category: mixed_conversation - Multi-turn with different intents
+    TestThread(
+        queries=(
+            "I'm new to investing. Can you help me get started?",
+            "What are the different types of investments?",
+            "How do I choose a good investment?",
+            "What's diversification and why is it important?",
+            "What's a good long-term investment strategy?"
+        ),
+        expected_intent="basic_info",
+        expected_overrides={0: "simple_chat", 2: "comprehensive_trade", 4: "comprehensive_trade"},
+        description="Mixed conversation - various intents",
+        category="mixed_conversation"
+    )
+)
+
+# Test categories indexed by name, for single-category runs
+_THREADS_BY_CATEGORY: Dict[str, TestThread] = {thread.category: thread for thread in _TEST_THREADS}
+
 
 class IntentClassificationTestSuite:
     """Test suite for intent classification accuracy."""
 
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY, use_cache: bool = False):
+        """
+        Initialize the test suite.
+
+        Args:
+            max_concurrency: Maximum number of classification calls in flight at once
+            use_cache: Serve and store classifications in the persistent cache; off by
+                default so every run measures live classification
+        """
+        self._max_concurrency = max_concurrency
+        # Dedicated pool: asyncio's default executor is capped at cpu_count + 4 workers
+        self._classification_executor = ThreadPoolExecutor(max_workers=max_concurrency)
+        # Classifications keyed by normalized query; concurrent duplicates share one call
+        self._classification_futures: Dict[str, asyncio.Future] = {}
+        # Successful classifications keyed by _intent_cache_key; errors are never cached
+        self._use_cache = use_cache
+        self._intent_cache = (
+            TTLCache(maxsize=INTENT_CACHE_MAX_ENTRIES, ttl=INTENT_CACHE_TTL_SECONDS)
+            if CACHETOOLS_AVAILABLE else {}
+        )
+        self._disk_cache = diskcache.Cache(INTENT_CACHE_DIR) if use_cache and DISKCACHE_AVAILABLE else None
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._traceback_logged = False
+        self._traceback_lock = threading.Lock()
+
+    @cached_property
+    def _orchestrator(self):
+        """Agent orchestrator, resolved once on first classification."""
+        return get_agent_orchestrator()
+
+    @cached_property
+    def _classifier_fingerprint(self) -> str:
+        """
+        Hash of the classifier's model and system prompt and of the intent-to-workflow
+        mapping, so cached classifications are invalidated when any of them changes.
+        """
+        from models.query_intent import QueryIntent
+
+        orchestrator = self._orchestrator
+        classifier = orchestrator.classifier
+        workflows = "\n".join(
+            f"{intent.value}: {orchestrator.workflow_mapper.get_workflow_config(intent)!r} "
+            f"{orchestrator._get_agents_for_simple_intent(intent)} "
+            f"{orchestrator._build_agent_selection_prompt('', intent)}"
+            for intent in QueryIntent
+        )
+        return hashlib.sha256(
+            f"{classifier.model}\n{classifier._build_classification_prompt()}\n{workflows}".encode("utf-8")
+        ).hexdigest()
+
+    def _get_cached_intent(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached classification in memory, then on disk, counting hits and misses."""
+        if not self._use_cache:
+            result = None
+        else:
+            with self._cache_lock:
+                result = self._intent_cache.get(key)
+            if result is None and self._disk_cache is not None:
+                result = self._disk_cache.get(key)
+                if result is not None:
+                    with self._cache_lock:
+                        self._intent_cache[key] = result
+
+        with self._cache_lock:
+            if result is None:
+                self.cache_misses += 1
+            else:
+                self.cache_hits += 1
+        return result
+
+    def _cache_intent(self, key: str, result: Dict[str, Any]) -> None:
+        """Store a successful classification in memory and on disk (only when caching is enabled)."""
+        if not self._use_cache:
+            return
+        with self._cache_lock:
+            self._intent_cache[key] = result
+        if self._disk_cache is not None:
+            self._disk_cache.set(key, result, expire=INTENT_CACHE_TTL_SECONDS)
+
+    def _is_cached(self, key: str) -> bool:
+        """Whether a classification is cached, without counting a hit or miss."""
+        if not self._use_cache:
+            return False
+        with self._cache_lock:
+            if key in self._intent_cache:
+                return True
+        return self._disk_cache is not None and key in self._disk_cache
+
+    def warm_up(self, queries: List[str]) -> None:
+        """
+        Issue one throwaway classification before timing starts, so connection setup
+        and the provider's prompt-prefix cache aren't charged to the first category.
+        Skipped when every query will be served from the cache.
+        """
+        if not _ensure_intent_imports():
+            return
+        if all(self._is_cached(_intent_cache_key(self._classifier_fingerprint, query)) for query in queries):
+            logger.debug("All %d queries are cached; skipping warm-up", len(queries))
+            return
+        try:
+            self._orchestrator.classify_and_get_workflow("warm")
+        except Exception as e:
+            logger.debug("Warm-up classification failed: %s", e)
+
+    def _wants_traceback(self) -> bool:
+        """Log a full traceback for the first unexpected failure in the run, or for every one at DEBUG."""
+        with self._traceback_lock:
+            first_failure = not self._traceback_logged
+            self._traceback_logged = True
+        return first_failure or logger.isEnabledFor(logging.DEBUG)
+
     def classify_query_intent(self, query: str) -> Dict[str, Any]:
         """Classify query intent using instructor-based LLM classifier ONLY (no fallback)."""
-        if not INTENT_CLASSIFICATION_AVAILABLE:
-            error_msg = "Instructor-based classification is required but not available"
-            logger.error(f"{error_msg}. Install instructor library and configure OpenAI API.")
-            return {
-                "intent": "error",
-                "error": error_msg,
-                "classification_method": "failed"
-            }
-
+        global _unavailable_warned
+        if not _ensure_intent_imports():
+            if not _unavailable_warned:
+                _unavailable_warned = True
+                logger.error(
+                    "%s. Install instructor library and configure OpenAI API.", _UNAVAILABLE_RESULT["error"]
+                )
+            return _UNAVAILABLE_RESULT
+
+        key = _intent_cache_key(self._classifier_fingerprint, query)
+        cached = self._get_cached_intent(key)
+        if cached is not None:
+            return cached
+        return self._classify_uncached(query, key)
+
+    def _classify_uncached(self, query: str, key: str) -> Dict[str, Any]:
+        """Classify a query through the orchestrator and cache the result if it succeeds."""
         try:
             # Use instructor-based LLM classification through the orchestrator
-            orchestrator = get_agent_orchestrator()
-            intent, workflow = orchestrator.classify_and_get_workflow(query)
-
-            result = {
-                "intent": intent.value if hasattr(intent, 'value') else str(intent),
-                "workflow_type": workflow.workflow_type,
-                "agents": workflow.agents,
-                "timeout_seconds": workflow.timeout_seconds,
-                "classification_method": "instructor_llm"
-            }
+            intent, workflow = self._orchestrator.classify_and_get_workflow(query)
+            result = _classification_result(*_summarize_classification(intent, workflow))
+            self._cache_intent(key, result)
 
-            logger.debug(f"Instructor classified '{query[:50]}...' as {result['intent']}")
+            logger.debug("Instructor classified '%.50s...' as %s", query, result["intent"])
             return result
 
         except Exception as e:
             error_msg = f"Instructor-based classification failed: {str(e)}"
-            logger.error(error_msg)
+            logger.error(error_msg, exc_info=self._wants_traceback())
             return {
                 "intent": "error",
                 "error": error_msg,
@@ -79,167 +527,136 @@ class IntentClassificationTestSuite:
 
     
     
-    def generate_test_queries(self, category_filter: Optional[str] = None) -> List[TestThread]:
-        """Generate test queries organized by category."""
+    async def classify_batch(self, queries: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify several queries with a single orchestrator batch call.
 
-        test_threads = []
-
-        # Category: simple_chat - No agents, direct OpenAI responses
-        test_threads.append(TestThread(
-            queries=[
-                "Hello! What are you?",
-                "What can you help me with?",
-                "Tell me about yourself",
-                "What is Meridian?",
-                "How can you help me with investing?"
-            ],
-            description="Simple chat - no agents",
-            category="simple_chat",
-            expected_intents=["simple_chat", "simple_chat", "simple_chat", "simple_chat", "simple_chat"]
-        ))
-
-        # Category: basic_info - Single agent (information)
-        test_threads.append(TestThread(
-            queries=[
-                "What is Apple stock trading at today?",
-                "What is Tesla's business?",
-                "What's Microsoft's main products?",
-                "What is NVIDIA doing?",
-                "What's Amazon's business model?"
-            ],
-            description="Basic info - information agent",
-            category="basic_info",
-            expected_intents=["basic_info", "basic_info", "basic_info", "basic_info", "basic_info"]
-        ))
-
-        # Category: technical_analysis - Single agent (market)
-        test_threads.append(TestThread(
-            queries=[
-                "Run a market analysis on AAPL",
-                "Apple stock technical analysis",
-                "What's the technical outlook for Tesla?",
-                "Show me technical indicators for Microsoft",
-                "Technical chart analysis for NVIDIA"
-            ],
-            description="Technical analysis - market agent",
-            category="technical_analysis",
-            expected_intents=["technical_analysis", "technical_analysis", "technical_analysis", "technical_analysis", "technical_analysis"]
-        ))
-
-        # Category: fundamental_analysis - Single agent (fundamentals)
-        test_threads.append(TestThread(
-            queries=[
-                "Analyze Apple's fundamentals",
-                "Get fundamental data for Apple",
-                "Tesla's financial health",
-                "Microsoft's financial metrics",
-                "NVIDIA's valuation analysis"
-            ],
-            description="Fundamental analysis - fundamentals agent",
-            category="fundamental_analysis",
-            expected_intents=["fundamental_analysis", "fundamental_analysis", "fundamental_analysis", "fundamental_analysis", "fundamental_analysis"]
-        ))
-
-        # Category: market_overview - Multi-agent (market + information)
-        test_threads.append(TestThread(
-            queries=[
-                "What are the major stock indices?",
-                "What's the Dow Jones?",
-                "Explain S&P 500",
-                "What's NASDAQ?",
-                "How do stock indices work?"
-            ],
-            description="Market overview - market and information agents",
-            category="market_overview",
-            expected_intents=["market_overview", "market_overview", "market_overview", "market_overview", "market_overview"]
-        ))
-
-        # Category: comprehensive_analysis - Full workflow (multiple agents)
-        test_threads.append(TestThread(
-            queries=[
-                "Should I buy Apple stock today?",
-                "Is Tesla overvalued?",
-                "Bull case for Tesla",
-                "Risk assessment for Microsoft",
-                "Comprehensive analysis of AMZN"
-            ],
-            description="Comprehensive analysis - full workflow",
-            category="comprehensive_analysis",
-            expected_intents=["comprehensive_trade", "comprehensive_trade", "comprehensive_trade", "comprehensive_trade", "comprehensive_trade"]
-        ))
-
-        # Category: investment_analysis - Broad investment queries that should trigger full workflow
-        test_threads.append(TestThread(
-            queries=[
-                "Is Apple a good investment?",
-                "Should I invest in Tesla?",
-                "Analyze Microsoft stock for me",
-                "Evaluate NVIDIA as an investment",
-                "What do you think about Amazon stock?",
-                "Is Google worth buying?",
-                "Meta investment opportunity",
-                "Long-term potential of Apple",
-                "Risk analysis for Tesla",
-                "Investment recommendation for Microsoft"
-            ],
-            description="Broad investment analysis - should trigger comprehensive workflow",
-            category="investment_analysis",
-            expected_intents=["comprehensive_trade", "comprehensive_trade", "comprehensive_trade", "comprehensive_trade", "comprehensive_trade", "comprehensive_trade", "comprehensive_trade", "comprehensive_trade", "comprehensive_trade", "comprehensive_trade"]
-        ))
-
-        # Category: news_sentiment - News and sentiment analysis
-        test_threads.append(TestThread(
-            queries=[
-                "What's the news on Apple today?",
-                "Tesla social media sentiment",
-                "Microsoft recent announcements",
-                "Market sentiment for NVIDIA",
-                "Breaking news in tech stocks"
-            ],
-            description="News and sentiment analysis",
-            category="news_sentiment",
-            expected_intents=["news_sentiment", "news_sentiment", "news_sentiment", "news_sentiment", "news_sentiment"]
-        ))
-
-        # Category: portfolio_review - Portfolio analysis
-        test_threads.append(TestThread(
-            queries=[
-                "How is my portfolio performing?",
-                "Review my investments",
-                "Portfolio allocation analysis",
-                "Should I rebalance my portfolio?",
-                "Portfolio risk assessment"
-            ],
-            description="Portfolio analysis and review",
-            category="portfolio_review",
-            expected_intents=["portfolio_review", "portfolio_review", "portfolio_review", "portfolio_review", "portfolio_review"]
-        ))
-
-        # Category: mixed_conversation - Multi-turn with different intents
-        test_threads.append(TestThread(
-            queries=[
-                "I'm new to investing. Can you help me get started?",
-                "What are the different types of investments?",
-                "How do I choose a good investment?",
-                "What's diversification and why is it important?",
-                "What's a good long-term investment strategy?"
-            ],
-            description="Mixed conversation - various intents",
-            category="mixed_conversation",
-            expected_intents=["simple_chat", "basic_info", "comprehensive_trade", "basic_info", "comprehensive_trade"]
-        ))
-
-        # Filter by category if specified
-        if category_filter:
-            test_threads = [t for t in test_threads if t.category == category_filter]
-            if not test_threads:
-                logger.warning(f"No test threads found for category: {category_filter}")
+        Only queries missing from the intent cache are sent. Blocking work runs in
+        the suite's worker pool, and backoff between retries sleeps on the event loop.
+        """
+        if not _ensure_intent_imports():
+            return [self.classify_query_intent(query) for query in queries]
+
+        loop = asyncio.get_running_loop()
+        keys, results, misses = await loop.run_in_executor(
+            self._classification_executor, self._partition_cached, queries
+        )
+        if misses:
+            results.update(await self._classify_misses(misses))
+        return [results[key] for key in keys]
+
+    def _partition_cached(
+        self, queries: List[str]
+    ) -> Tuple[List[str], Dict[str, Dict[str, Any]], Dict[str, str]]:
+        """Cache keys for queries, plus cached results and uncached queries keyed by them."""
+        keys = [_intent_cache_key(self._classifier_fingerprint, query) for query in queries]
+        results: Dict[str, Dict[str, Any]] = {}
+        misses: Dict[str, str] = {}
+        for key, query in zip(keys, queries):
+            if key in results or key in misses:
+                continue
+            cached = self._get_cached_intent(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                misses[key] = query
+        return keys, results, misses
+
+    async def _classify_misses(self, misses: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Classify uncached queries in one batch, retrying transient provider failures.
+        Other failures, and the last attempt, fall back to per-query classification,
+        so one bad query doesn't turn the whole batch into errors.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(1, CLASSIFY_MAX_ATTEMPTS + 1):
+            try:
+                return await loop.run_in_executor(self._classification_executor, self._classify_batch_once, misses)
+            except Exception as e:
+                transient = _is_transient_error(e)
+                if transient and attempt < CLASSIFY_MAX_ATTEMPTS:
+                    delay = CLASSIFY_RETRY_BASE_DELAY * 2 ** (attempt - 1)
+                    logger.warning(
+                        "Batch classification attempt %d/%d failed transiently: %r; retrying in %.1fs",
+                        attempt, CLASSIFY_MAX_ATTEMPTS, e, delay
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                if transient:
+                    logger.warning("Batch classification failed transiently, classifying queries individually: %r", e)
+                else:
+                    logger.error(
+                        "Batch classification failed, classifying queries individually: %s", e,
+                        exc_info=self._wants_traceback()
+                    )
+                return await loop.run_in_executor(self._classification_executor, self._classify_each, misses)
+
+    def _classify_batch_once(self, misses: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Classify uncached queries with one orchestrator batch call and cache the results."""
+        classified = self._orchestrator.classify_and_get_workflow_batch(list(misses.values()))
+        results = {}
+        for key, (intent, workflow) in zip(misses, classified):
+            results[key] = _classification_result(*_summarize_classification(intent, workflow))
+            self._cache_intent(key, results[key])
+        return results
+
+    def _classify_each(self, misses: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Classify uncached queries one at a time."""
+        return {key: self._classify_uncached(query, key) for key, query in misses.items()}
 
-        return test_threads
+    def generate_test_queries(self, category_filter: Optional[str] = None) -> List[TestThread]:
+        """Generate test queries organized by category."""
+        if not category_filter:
+            return list(_TEST_THREADS)
+
+        # Look up the requested category directly
+        thread = _THREADS_BY_CATEGORY.get(category_filter)
+        if thread is None:
+            logger.warning(f"No test threads found for category: {category_filter}")
+            return []
+        return [thread]
     
-    def run_category_test(self, thread: TestThread) -> Dict[str, Any]:
+    async def _classify_with_limit(self, query: str) -> Dict[str, Any]:
+        """
+        Classify a query in a worker thread, bounded by the suite's concurrency limit.
+        Identical queries (ignoring case and surrounding whitespace) are coalesced
+        into a single classification.
+        """
+        key = _normalize_query(query)
+        future = self._classification_futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self._classification_executor, self.classify_query_intent, query)
+            self._classification_futures[key] = future
+        return await future
+
+    def _schedule_batch_classification(self, queries: List[str]) -> None:
+        """
+        Classify the distinct, not-yet-classified queries in batches spread across
+        the worker pool. Results seed the coalescing map, so category tests await
+        them instead of classifying each query on its own.
+        """
+        pending: Dict[str, str] = {}
+        for query in queries:
+            key = _normalize_query(query)
+            if key not in self._classification_futures:
+                pending.setdefault(key, query)
+        if not pending:
+            return
+
+        loop = asyncio.get_running_loop()
+        keys = list(pending)
+        batch_size = -(-len(keys) // self._max_concurrency)
+        for start in range(0, len(keys), batch_size):
+            chunk = keys[start:start + batch_size]
+            futures = [loop.create_future() for _ in chunk]
+            self._classification_futures.update(zip(chunk, futures))
+            batch = asyncio.ensure_future(self.classify_batch([pending[key] for key in chunk]))
+            batch.add_done_callback(partial(_resolve_batch, futures))
+
+    async def run_category_test(self, thread: TestThread) -> Dict[str, Any]:
         """Run intent classification test for a category."""
-        logger.info(f"Testing category: {thread.description} ({len(thread.queries)} queries)")
+        logger.info("Testing category: %s (%d queries)", thread.description, len(thread.queries))
 
         results = {
             "category": thread.category,
@@ -254,33 +671,39 @@ class IntentClassificationTestSuite:
             }
         }
 
-        # Test each query in the category
-        for i, query in enumerate(thread.queries):
+        # Classify all queries in the category concurrently
+        intent_results = await asyncio.gather(
+            *(self._classify_with_limit(query) for query in thread.queries),
+            return_exceptions=True
+        )
+        classified_at = datetime.now().isoformat()
+        traceback_logged = False
+
+        # Score each query in the category
+        for i, (query, intent_result) in enumerate(zip(thread.queries, intent_results)):
+            expected_intent = thread.expected_intent_for(i)
             try:
-                logger.debug(f"Testing query {i+1}/{len(thread.queries)}: {query[:50]}...")
+                logger.debug("Testing query %d/%d: %.50s...", i + 1, len(thread.queries), query)
 
-                # Classify query intent
-                intent_result = self.classify_query_intent(query)
-                expected_intent = thread.expected_intents[i] if i < len(thread.expected_intents) else None
+                if isinstance(intent_result, BaseException):
+                    raise intent_result
 
                 # Check if classification matches expected
-                intent_correct = False
-                if expected_intent and intent_result and intent_result.get("intent") != "error":
-                    intent_correct = (intent_result.get("intent") == expected_intent)
+                got = intent_result.get("intent")
+                intent_correct = got == expected_intent
 
                 if intent_correct:
                     results["intent_classification"]["correct"] += 1
-                    logger.debug(f"✓ Query {i+1} correct: {intent_result.get('intent')}")
+                    logger.debug("✓ Query %d correct: %s", i + 1, got)
                 else:
                     results["intent_classification"]["incorrect"] += 1
-                    if expected_intent:
-                        logger.warning(
-                            f"✗ Query {i+1} incorrect: expected '{expected_intent}', "
-                            f"got '{intent_result.get('intent')}' for query: {query[:50]}..."
-                        )
-                        results["intent_classification"]["errors"].append(
-                            f"Query {i+1}: expected '{expected_intent}', got '{intent_result.get('intent')}'"
-                        )
+                    logger.warning(
+                        "✗ Query %d incorrect: expected '%s', got '%s' for query: %.50s...",
+                        i + 1, expected_intent, got, query
+                    )
+                    results["intent_classification"]["errors"].append(
+                        f"Query {i+1}: expected '{expected_intent}', got '{got}'"
+                    )
 
                 query_result = {
                     "query_number": i + 1,
@@ -288,18 +711,23 @@ class IntentClassificationTestSuite:
                     "intent_classification": intent_result,
                     "expected_intent": expected_intent,
                     "intent_correct": intent_correct,
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": classified_at
                 }
 
                 results["queries"].append(query_result)
 
             except Exception as e:
-                logger.error(f"Error testing query {i+1}: {e}", exc_info=True)
+                # Full traceback for the first failing query in the category (or every one at DEBUG)
+                logger.error(
+                    "Error testing query %d: %s", i + 1, e,
+                    exc_info=not traceback_logged or logger.isEnabledFor(logging.DEBUG)
+                )
+                traceback_logged = True
                 query_result = {
                     "query_number": i + 1,
                     "query": query,
                     "error": str(e),
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": classified_at
                 }
                 results["queries"].append(query_result)
                 results["intent_classification"]["incorrect"] += 1
@@ -309,56 +737,102 @@ class IntentClassificationTestSuite:
         results["intent_classification"]["accuracy_percent"] = round(accuracy, 2)
 
         logger.info(
-            f"Category {thread.category}: {results['intent_classification']['correct']}/{results['intent_classification']['total']} correct "
-            f"({accuracy:.1f}% accuracy)"
+            "Category %s: %d/%d correct (%.1f%% accuracy)",
+            thread.category,
+            results["intent_classification"]["correct"],
+            results["intent_classification"]["total"],
+            accuracy
         )
 
         return results
     
-    def run_full_test_suite(self, category_filter: Optional[str] = None) -> Dict[str, Any]:
-        """Run the complete intent classification test suite."""
+    async def _safe_run_category_test(self, index: int, total: int, thread: TestThread) -> Dict[str, Any]:
+        """Run a category test, converting failures into an error result so sibling categories keep running."""
+        logger.info("Testing category %d/%d: %s", index + 1, total, thread.description)
+        try:
+            return await self.run_category_test(thread)
+        except Exception as e:
+            logger.error("Failed to test category %s: %s", thread.description, e)
+            return {
+                "category": thread.category,
+                "description": thread.description,
+                "error": str(e),
+                "total_queries": len(thread.queries)
+            }
+
+    async def run_full_test_suite(
+        self,
+        category_filter: Optional[str] = None,
+        results_stream: Optional[BinaryIO] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the complete intent classification test suite.
+
+        Args:
+            category_filter: Only run this category (default: all categories)
+            results_stream: Optional binary stream; each category result is written
+                to it as a JSON line as soon as that category completes, and only its
+                summary (without per-query results) is kept in the returned results
+        """
         logger.info("Starting Intent Classification Test Suite...")
         if category_filter:
-            logger.info(f"Filtering by category: {category_filter}")
+            logger.info("Filtering by category: %s", category_filter)
 
         start_time = datetime.now()
+        started = time.perf_counter()
         test_threads = self.generate_test_queries(category_filter=category_filter)
 
-        logger.info(f"Generated {len(test_threads)} test categories with {sum(len(t.queries) for t in test_threads)} total queries")
+        total_queries = sum(len(t.queries) for t in test_threads)
+        logger.info("Generated %d test categories with %d total queries", len(test_threads), total_queries)
 
         results = {
             "test_suite_info": {
                 "start_time": start_time.isoformat(),
                 "total_categories": len(test_threads),
-                "total_queries": sum(len(t.queries) for t in test_threads),
-                "intent_classification_available": INTENT_CLASSIFICATION_AVAILABLE
+                "total_queries": total_queries,
+                "intent_classification_available": _ensure_intent_imports()
             },
             "category_results": []
         }
 
-        # Run each category test
-        for i, thread in enumerate(test_threads):
-            logger.info(f"Testing category {i+1}/{len(test_threads)}: {thread.description}")
-            try:
-                category_result = self.run_category_test(thread)
-                results["category_results"].append(category_result)
-            except Exception as e:
-                logger.error(f"Failed to test category {thread.description}: {e}")
-                results["category_results"].append({
-                    "category": thread.category,
-                    "description": thread.description,
-                    "error": str(e),
-                    "total_queries": len(thread.queries)
-                })
+        self._schedule_batch_classification([query for t in test_threads for query in t.queries])
+
+        progress = tqdm(total=total_queries, unit="query", desc="Classifying") if TQDM_AVAILABLE else None
+
+        # Overall intent classification counters, updated as each category completes
+        totals = {"total": 0, "correct": 0, "incorrect": 0}
+
+        async def run_and_stream(index: int, thread: TestThread) -> Dict[str, Any]:
+            category_result = await self._safe_run_category_test(index, len(test_threads), thread)
+            ic = category_result.get("intent_classification")
+            if ic is not None:
+                for key in totals:
+                    totals[key] += ic.get(key, 0)
+            if results_stream is not None:
+                results_stream.write(_json_line(category_result))
+                # Per-query detail now lives in the stream; keep only the category summary in memory
+                category_result = {k: v for k, v in category_result.items() if k != "queries"}
+            if progress is not None:
+                progress.update(len(thread.queries))
+            return category_result
+
+        # Run all category tests concurrently; the shared executor bounds
+        # the total number of in-flight classifications
+        try:
+            results["category_results"] = await asyncio.gather(
+                *(run_and_stream(i, thread) for i, thread in enumerate(test_threads))
+            )
+        finally:
+            if progress is not None:
+                progress.close()
 
         # Calculate final statistics
+        duration = time.perf_counter() - started
         end_time = datetime.now()
-        duration = (end_time - start_time).total_seconds()
 
-        # Calculate overall intent classification statistics
-        total_classifications = sum(r.get("intent_classification", {}).get("total", 0) for r in results["category_results"] if "intent_classification" in r)
-        correct_classifications = sum(r.get("intent_classification", {}).get("correct", 0) for r in results["category_results"] if "intent_classification" in r)
-        incorrect_classifications = sum(r.get("intent_classification", {}).get("incorrect", 0) for r in results["category_results"] if "intent_classification" in r)
+        total_classifications = totals["total"]
+        correct_classifications = totals["correct"]
+        incorrect_classifications = totals["incorrect"]
 
         overall_accuracy = (correct_classifications / total_classifications * 100) if total_classifications > 0 else 0
 
@@ -370,11 +844,19 @@ class IntentClassificationTestSuite:
                 "correct": correct_classifications,
                 "incorrect": incorrect_classifications,
                 "accuracy_percent": round(overall_accuracy, 2)
+            },
+            "classification_cache": {
+                "enabled": self._use_cache,
+                "hits": self.cache_hits,
+                "misses": self.cache_misses
             }
         })
 
-        logger.info(f"Test suite completed in {duration:.2f} seconds")
-        logger.info(f"Overall Intent Classification: {correct_classifications}/{total_classifications} correct ({overall_accuracy:.2f}% accuracy)")
+        logger.info("Test suite completed in %.2f seconds", duration)
+        logger.info(
+            "Overall Intent Classification: %d/%d correct (%.2f%% accuracy)",
+            correct_classifications, total_classifications, overall_accuracy
+        )
 
         return results
     
@@ -401,29 +883,35 @@ Available categories:
 Example usage:
   python test_user_query_intents.py --category comprehensive_analysis
   python test_user_query_intents.py --category simple_chat
+  python test_user_query_intents.py --concurrency 4
+  python test_user_query_intents.py --cache
   python test_user_query_intents.py  # Run all categories
         """
     )
     parser.add_argument(
         "--category",
         type=str,
-        choices=[
-            "simple_chat",
-            "basic_info",
-            "technical_analysis",
-            "fundamental_analysis",
-            "news_sentiment",
-            "market_overview",
-            "comprehensive_analysis",
-            "investment_analysis",
-            "portfolio_review",
-            "mixed_conversation"
-        ],
+        choices=tuple(_THREADS_BY_CATEGORY),
         default=None,
         help="Category of queries to test (default: all categories)"
     )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Reuse classifications from the persistent cache (default: classify every query live)"
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENCY,
+        help=f"Maximum number of classification calls in flight at once (default: {DEFAULT_MAX_CONCURRENCY})"
+    )
 
     args = parser.parse_args()
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.cache and not DISKCACHE_AVAILABLE:
+        parser.error("--cache requires diskcache (pip install diskcache)")
     category_filter = args.category
 
     logger.info("Meridian Intent Classification Test Suite")
@@ -433,16 +921,29 @@ Example usage:
     logger.info("")
 
     try:
-        test_suite = IntentClassificationTestSuite()
-        results = test_suite.run_full_test_suite(category_filter=category_filter)
-
-        # Save results to file
         category_suffix = f"_{category_filter}" if category_filter else "_all"
-        output_file = f"intent_classification_test_results{category_suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(output_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
+        output_base = f"intent_classification_test_results{category_suffix}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        results_file = f"{output_base}.jsonl"
+        output_file = f"{output_base}.json"
 
-        logger.info(f"Results saved to {output_file}")
+        if UVLOOP_AVAILABLE:
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+        # Per-category results are streamed to a JSON-lines file as they complete
+        test_suite = IntentClassificationTestSuite(max_concurrency=args.concurrency, use_cache=args.cache)
+        test_suite.warm_up(
+            [query for thread in test_suite.generate_test_queries(category_filter) for query in thread.queries]
+        )
+        with open(results_file, 'wb') as stream:
+            results = asyncio.run(
+                test_suite.run_full_test_suite(category_filter=category_filter, results_stream=stream)
+            )
+
+        # Save the suite summary separately
+        with open(output_file, 'wb') as f:
+            f.write(_json_pretty({"test_suite_info": results["test_suite_info"]}))
+
+        logger.info(f"Results saved to {results_file} (summary: {output_file})")
 
         # Print summary
         info = results["test_suite_info"]
@@ -462,7 +963,12 @@ Example usage:
             print(f"  Incorrect: {overall['incorrect']}")
             print(f"  Accuracy: {overall['accuracy_percent']}%")
 
-        print(f"\nDetailed results saved to: {output_file}")
+        cache_stats = info.get('classification_cache', {})
+        if cache_stats.get('enabled'):
+            print(f"Classification Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+        print(f"\nSummary saved to: {output_file}")
+        print(f"Detailed results saved to: {results_file}")
 
         # Show per-category breakdown
         if results.get("category_results"):
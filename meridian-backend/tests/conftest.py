@@ -43,44 +43,60 @@ except Exception as e:
 
 @pytest.fixture
 def client():
-    """Create test client for FastAPI app."""
+    """Create test client for FastAPI app (runs the app's lifespan startup and shutdown)."""
     from fastapi.testclient import TestClient
-    return TestClient(app)
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _uses_real_db(request) -> bool:
+    """Whether the test needs a real database (integration tests using credentials from .env)."""
+    return any(marker.name in ("requires_db", "requires_gcp") for marker in request.node.iter_markers())
 
 
 @pytest.fixture(autouse=True)
-def mock_config(monkeypatch, request):
-    """Mock configuration for testing (auto-use for all tests)."""
-    # Set test environment variables
+def base_test_env(monkeypatch, request):
+    """Set test environment variables (auto-use for all tests)."""
     monkeypatch.setenv("OPENAI_API_KEY", "test-api-key")
     monkeypatch.setenv("PORT", "8000")
     monkeypatch.setenv("LOG_LEVEL", "DEBUG")
     monkeypatch.setenv("ENVIRONMENT", "testing")
     monkeypatch.setenv("AGENTS_SERVICE_URL", "http://localhost:8001")
     
-    # Check if test requires real database - if so, don't override DB env vars
-    # This allows integration tests to use real credentials from .env file
-    requires_db = any(marker.name == "requires_db" for marker in request.node.iter_markers())
-    requires_gcp = any(marker.name == "requires_gcp" for marker in request.node.iter_markers())
-    
-    if not (requires_db or requires_gcp):
+    # Tests that require a real database keep the DB env vars from the .env file
+    if not _uses_real_db(request):
         # Database config (only set for non-integration tests)
         monkeypatch.setenv("DB_HOST", "test-host")
         monkeypatch.setenv("DB_USER", "test-user")
         monkeypatch.setenv("DB_PASSWORD", "test-password")
         monkeypatch.setenv("DB_NAME", "test-db")
         monkeypatch.setenv("DB_TYPE", "postgresql")
-    
-    # Reload config if available
+
+
+# Config objects built by mock_config, keyed by whether real database env vars were kept
+_config_cache = {}
+
+
+@pytest.fixture(autouse=True)
+def mock_config(base_test_env, request):
+    """Reload configuration from the test environment (only for tests marked needs_config)."""
+    if request.node.get_closest_marker("needs_config") is None:
+        return None
+
+    # Reload config if available, reusing one built for the same environment
     try:
         from utils.config import get_config
         import utils.config as config_module
-        if hasattr(config_module, '_config'):
-            config_module._config = None
-        return get_config()
     except ImportError:
-        # If import fails, just set env vars
-        pass
+        # If import fails, the env vars are still set
+        return None
+
+    uses_real_db = _uses_real_db(request)
+    if uses_real_db not in _config_cache:
+        config_module._config = None
+        _config_cache[uses_real_db] = get_config()
+    config_module._config = _config_cache[uses_real_db]
+    return config_module._config
 
 
 @pytest.fixture
@@ -4,6 +4,9 @@ Integration tests for API endpoints.
 import pytest
 from unittest.mock import patch, MagicMock, AsyncMock
 
+# The app reads its settings through get_config(), so reload it from the test environment
+pytestmark = pytest.mark.needs_config
+
 
 @pytest.mark.integration
 class TestHealthEndpoint:
@@ -6,22 +6,35 @@ import pytest
 import asyncio
 import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
+from typing import Dict, Optional
 from unittest.mock import patch, AsyncMock
-from dotenv import load_dotenv
+from dotenv import dotenv_values, load_dotenv
 from sqlalchemy import text
 
-# Load environment variables from .env file
-# Try loading from project root first, then backend directory
+# Load environment variables from the first .env file found:
+# project root, then backend directory, then current directory
 project_root = Path(__file__).parent.parent.parent.parent
 backend_dir = Path(__file__).parent.parent.parent
-load_dotenv(dotenv_path=project_root / ".env")
-load_dotenv(dotenv_path=backend_dir / ".env")
-load_dotenv()  # Also try current directory
+_ENV_FILE = next(
+    (path for path in (project_root / ".env", backend_dir / ".env", Path(".env")) if path.is_file()),
+    None
+)
+if _ENV_FILE:
+    load_dotenv(dotenv_path=_ENV_FILE, override=False)
 
-# Resolve GOOGLE_APPLICATION_CREDENTIALS path if set
-credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-if credentials_path:
+
+@lru_cache(maxsize=4)
+def _resolved_credentials_path(credentials_path: Optional[str]) -> Optional[str]:
+    """
+    Resolve a GOOGLE_APPLICATION_CREDENTIALS value to an absolute path.
+    Relative paths are tried against the project root, then the backend directory.
+    Returns None if the file doesn't exist; cached so each path is only looked up once.
+    """
+    if not credentials_path:
+        return None
+    
     # Handle relative paths
     if credentials_path.startswith("./"):
         credentials_path = credentials_path[2:]
@@ -38,9 +51,13 @@ if credentials_path:
             if abs_path.exists():
                 credentials_path = str(abs_path.absolute())
     
-    # Set absolute path if file exists
-    if os.path.exists(credentials_path):
-        os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = os.path.abspath(credentials_path)
+    return os.path.abspath(credentials_path) if os.path.exists(credentials_path) else None
+
+
+# Resolve GOOGLE_APPLICATION_CREDENTIALS path if set
+creds = _resolved_credentials_path(os.getenv("GOOGLE_APPLICATION_CREDENTIALS"))
+if creds:
+    os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = creds
 
 # Support DB_HOST as alias for INSTANCE_CONNECTION_NAME (for backward compatibility)
 if not os.getenv("INSTANCE_CONNECTION_NAME") and os.getenv("DB_HOST"):
@@ -61,429 +78,325 @@ DB_CONFIGURED = all([
 ])
 
 
-@pytest.fixture(autouse=True, scope="function")
-def ensure_db_env_vars(request, monkeypatch):
+def _resolve_db_env() -> Dict[str, str]:
+    """
+    Resolve the real database environment from _ENV_FILE without modifying os.environ.
+    Applies the DB_HOST/DB_PASSWORD aliases and makes GOOGLE_APPLICATION_CREDENTIALS absolute.
     """
-    Ensure database environment variables are loaded from .env for integration tests.
+    # Values from the .env file take precedence over (possibly mocked) process env vars
+    file_values = {k: v for k, v in dotenv_values(_ENV_FILE).items() if v is not None} if _ENV_FILE else {}
+    
+    def get(key: str) -> Optional[str]:
+        return file_values.get(key) or os.getenv(key)
+    
+    db_pass = get("DB_PASS") or get("DB_PASSWORD")
+    instance_name = get("INSTANCE_CONNECTION_NAME") or get("DB_HOST")
+    env = {
+        "DB_USER": get("DB_USER"),
+        "DB_PASS": db_pass,
+        "DB_PASSWORD": db_pass,
+        "DB_NAME": get("DB_NAME"),
+        "DB_TYPE": get("DB_TYPE"),
+        "INSTANCE_CONNECTION_NAME": instance_name,
+        "DB_HOST": instance_name,
+        "GOOGLE_APPLICATION_CREDENTIALS": _resolved_credentials_path(get("GOOGLE_APPLICATION_CREDENTIALS")),
+    }
+    return {key: value for key, value in env.items() if value}
+
+
+@pytest.fixture(scope="session")
+def resolved_db_env() -> Dict[str, str]:
+    """Real database environment, resolved once per test session."""
+    return _resolve_db_env()
+
+
+@pytest.fixture
+def db_env(resolved_db_env, monkeypatch):
+    """
+    Apply the real database environment for integration tests.
     This runs after mock_config, so it will restore real values if they were overridden.
-    Also resets the database client singleton to ensure fresh initialization.
     """
-    # Only run for tests marked with requires_db or requires_gcp
-    requires_db = any(marker.name == "requires_db" for marker in request.node.iter_markers())
-    requires_gcp = any(marker.name == "requires_gcp" for marker in request.node.iter_markers())
+    for key, value in resolved_db_env.items():
+        monkeypatch.setenv(key, value)
     
-    if requires_db or requires_gcp:
-        # Close any existing database client to force reinitialization with fresh env vars
-        try:
-            from database.cloud_sql_client import close_db_client, _client_instance
-            # Force reset the singleton
-            close_db_client()
-            # Also directly reset the module-level variable
-            import database.cloud_sql_client as db_module
-            db_module._client_instance = None
-        except Exception:
-            pass  # Ignore if client doesn't exist yet
-        
-        # Reload .env to ensure real credentials are used
-        # This ensures values from .env override any test mocks
-        load_dotenv(dotenv_path=project_root / ".env", override=True)
-        load_dotenv(dotenv_path=backend_dir / ".env", override=True)
-        load_dotenv(override=True)
-        
-        # Re-resolve GOOGLE_APPLICATION_CREDENTIALS
-        credentials_path = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-        if credentials_path:
-            if credentials_path.startswith("./"):
-                credentials_path = credentials_path[2:]
-            
-            if not os.path.isabs(credentials_path):
-                abs_path = project_root / credentials_path
-                if abs_path.exists():
-                    credentials_path = str(abs_path.absolute())
-                else:
-                    abs_path = backend_dir / credentials_path
-                    if abs_path.exists():
-                        credentials_path = str(abs_path.absolute())
-            
-            if os.path.exists(credentials_path):
-                abs_creds_path = os.path.abspath(credentials_path)
-                os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = abs_creds_path
-                monkeypatch.setenv("GOOGLE_APPLICATION_CREDENTIALS", abs_creds_path)
-        
-        # Re-apply aliases and set via monkeypatch to ensure they stick
-        if not os.getenv("INSTANCE_CONNECTION_NAME") and os.getenv("DB_HOST"):
-            instance_name = os.getenv("DB_HOST")
-            os.environ["INSTANCE_CONNECTION_NAME"] = instance_name
-            monkeypatch.setenv("INSTANCE_CONNECTION_NAME", instance_name)
-        
-        if not os.getenv("DB_PASS") and os.getenv("DB_PASSWORD"):
-            db_pass = os.getenv("DB_PASSWORD")
-            os.environ["DB_PASS"] = db_pass
-            monkeypatch.setenv("DB_PASS", db_pass)
-        
-        # Set all DB env vars via monkeypatch to ensure they override any mocks
-        db_user = os.getenv("DB_USER")
-        db_pass = os.getenv("DB_PASS") or os.getenv("DB_PASSWORD")
-        db_name = os.getenv("DB_NAME")
-        instance_name = os.getenv("INSTANCE_CONNECTION_NAME") or os.getenv("DB_HOST")
-        
-        if db_user:
-            monkeypatch.setenv("DB_USER", db_user)
-        if db_pass:
-            monkeypatch.setenv("DB_PASS", db_pass)
-            monkeypatch.setenv("DB_PASSWORD", db_pass)
-        if db_name:
-            monkeypatch.setenv("DB_NAME", db_name)
-        if instance_name:
-            monkeypatch.setenv("INSTANCE_CONNECTION_NAME", instance_name)
-            monkeypatch.setenv("DB_HOST", instance_name)
+    # Verify we have real credentials, not test mocks
+    if os.getenv("DB_USER") == "test-user":
+        raise ValueError(
+            "DB_USER is set to 'test-user' (test mock). "
+            "Integration tests require real database credentials from .env file. "
+            "Please ensure your .env file has correct DB_USER, DB_PASS, DB_NAME, "
+            "INSTANCE_CONNECTION_NAME, and GOOGLE_APPLICATION_CREDENTIALS set."
+        )
+
+
+@pytest.fixture(scope="class")
+def db_client(resolved_db_env):
+    """
+    Database client shared by all tests in a class, closed when the class finishes.
+    Connection setup (connector, TLS, engine) is paid once per class instead of per test.
+    """
+    if not DB_CONFIGURED:
+        pytest.skip("Database environment variables not configured")
+    
+    from database.cloud_sql_client import close_db_client, get_db_client
+    
+    with pytest.MonkeyPatch.context() as mp:
+        for key, value in resolved_db_env.items():
+            mp.setenv(key, value)
         
-        # Verify we have real credentials, not test mocks
-        final_db_user = os.getenv("DB_USER")
-        if final_db_user == "test-user":
-            raise ValueError(
-                "DB_USER is set to 'test-user' (test mock). "
-                "Integration tests require real database credentials from .env file. "
-                "Please ensure your .env file has correct DB_USER, DB_PASS, DB_NAME, "
-                "INSTANCE_CONNECTION_NAME, and GOOGLE_APPLICATION_CREDENTIALS set."
-            )
+        # Close any existing database client so the shared one uses the real env vars
+        close_db_client()
+        yield get_db_client()
+        close_db_client()
 
 
 @pytest.mark.integration
 @pytest.mark.requires_db
 @pytest.mark.requires_gcp
+@pytest.mark.usefixtures("db_env")
 class TestDatabaseConnection:
     """Tests for database connection."""
     
-    def test_connection(self):
+    def test_connection(self, db_client):
         """Test basic connection to Cloud SQL."""
-        if not DB_CONFIGURED:
-            pytest.skip("Database environment variables not configured")
-        
-        from database.cloud_sql_client import get_db_client
+        assert db_client is not None
         
-        try:
-            client = get_db_client()
-            assert client is not None
+        # Test connection - using synchronous SQLAlchemy API
+        with db_client.get_connection() as conn:
+            # Test basic query
+            result = conn.execute(text("SELECT 1"))
+            row = result.fetchone()
+            assert row[0] == 1
             
-            # Test connection - using synchronous SQLAlchemy API
-            with client.get_connection() as conn:
-                # Test basic query
-                result = conn.execute(text("SELECT 1"))
-                row = result.fetchone()
-                assert row[0] == 1
-                
-                # Test database name
-                result = conn.execute(text("SELECT current_database()"))
-                db_name = result.fetchone()[0]
-                assert db_name is not None
-                
-                # Test PostgreSQL version
-                result = conn.execute(text("SELECT version()"))
-                pg_version = result.fetchone()[0]
-                assert pg_version is not None
-        finally:
-            from database.cloud_sql_client import close_db_client
-            close_db_client()
+            # Test database name
+            result = conn.execute(text("SELECT current_database()"))
+            db_name = result.fetchone()[0]
+            assert db_name is not None
+            
+            # Test PostgreSQL version
+            result = conn.execute(text("SELECT version()"))
+            pg_version = result.fetchone()[0]
+            assert pg_version is not None
     
-    def test_table_existence(self):
+    def test_table_existence(self, db_client):
         """Check if threads and messages tables exist."""
-        if not DB_CONFIGURED:
-            pytest.skip("Database environment variables not configured")
-        
-        from database.cloud_sql_client import get_db_client
-        
-        try:
-            client = get_db_client()
+        with db_client.get_connection() as conn:
+            # Check threads table
+            result = conn.execute(text("""
+                SELECT EXISTS (
+                    SELECT FROM information_schema.tables 
+                    WHERE table_schema = 'public' 
+                    AND table_name = 'threads'
+                )
+            """))
+            threads_exists = result.fetchone()[0]
             
-            with client.get_connection() as conn:
-                # Check threads table
-                result = conn.execute(text("""
-                    SELECT EXISTS (
-                        SELECT FROM information_schema.tables 
-                        WHERE table_schema = 'public' 
-                        AND table_name = 'threads'
-                    )
-                """))
-                threads_exists = result.fetchone()[0]
-                
-                # Check messages table
-                result = conn.execute(text("""
-                    SELECT EXISTS (
-                        SELECT FROM information_schema.tables 
-                        WHERE table_schema = 'public' 
-                        AND table_name = 'messages'
-                    )
-                """))
-                messages_exists = result.fetchone()[0]
-                
-                assert threads_exists is True, "Threads table should exist"
-                assert messages_exists is True, "Messages table should exist"
-        finally:
-            from database.cloud_sql_client import close_db_client
-            close_db_client()
+            # Check messages table
+            result = conn.execute(text("""
+                SELECT EXISTS (
+                    SELECT FROM information_schema.tables 
+                    WHERE table_schema = 'public' 
+                    AND table_name = 'messages'
+                )
+            """))
+            messages_exists = result.fetchone()[0]
+            
+            assert threads_exists is True, "Threads table should exist"
+            assert messages_exists is True, "Messages table should exist"
 
 
 @pytest.mark.integration
 @pytest.mark.requires_db
 @pytest.mark.requires_gcp
+@pytest.mark.usefixtures("db_env")
 class TestDatabaseCRUD:
-    """Tests for CRUD operations."""
+    """
+    Tests for CRUD operations.
+    Each test runs in the connection's single implicit transaction and never commits,
+    so its writes are rolled back when the connection closes; no cleanup statements needed.
+    """
     
-    def test_create_thread(self):
+    def test_create_thread(self, db_client):
         """Test CREATE operation (INSERT thread)."""
-        if not DB_CONFIGURED:
-            pytest.skip("Database environment variables not configured")
+        test_thread_id = f"test-thread-{int(datetime.now().timestamp())}"
         
-        from database.cloud_sql_client import get_db_client
+        query = text("""
+            INSERT INTO threads (thread_id, title, created_at, updated_at, user_id)
+            VALUES (:thread_id, :title, :created_at, :updated_at, :user_id)
+            RETURNING thread_id, title, created_at
+        """)
         
-        try:
-            client = get_db_client()
-            test_thread_id = f"test-thread-{int(datetime.now().timestamp())}"
+        with db_client.get_connection() as conn:
+            result = conn.execute(query, {
+                "thread_id": test_thread_id,
+                "title": "Test Thread for CRUD",
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+                "user_id": "test-user"
+            })
+            row = result.fetchone()
             
-            query = text("""
-                INSERT INTO threads (thread_id, title, created_at, updated_at, user_id)
-                VALUES (:thread_id, :title, :created_at, :updated_at, :user_id)
-                RETURNING thread_id, title, created_at
-            """)
-            
-            with client.get_connection() as conn:
-                result = conn.execute(query, {
-                    "thread_id": test_thread_id,
-                    "title": "Test Thread for CRUD",
-                    "created_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow(),
-                    "user_id": "test-user"
-                })
-                row = result.fetchone()
-                
-                assert row is not None
-                assert row[0] == test_thread_id
-                assert row[1] == "Test Thread for CRUD"
-                
-                # Cleanup
-                conn.execute(text("DELETE FROM threads WHERE thread_id = :thread_id"), {
-                    "thread_id": test_thread_id
-                })
-        finally:
-            from database.cloud_sql_client import close_db_client
-            close_db_client()
+            assert row is not None
+            assert row[0] == test_thread_id
+            assert row[1] == "Test Thread for CRUD"
     
-    def test_read_thread(self):
+    def test_read_thread(self, db_client):
         """Test READ operation (SELECT thread)."""
-        if not DB_CONFIGURED:
-            pytest.skip("Database environment variables not configured")
+        test_thread_id = f"test-thread-{int(datetime.now().timestamp())}"
         
-        from database.cloud_sql_client import get_db_client
+        # Create a thread first
+        create_query = text("""
+            INSERT INTO threads (thread_id, title, created_at, updated_at, user_id)
+            VALUES (:thread_id, :title, :created_at, :updated_at, :user_id)
+        """)
         
-        try:
-            client = get_db_client()
-            test_thread_id = f"test-thread-{int(datetime.now().timestamp())}"
+        with db_client.get_connection() as conn:
+            conn.execute(create_query, {
+                "thread_id": test_thread_id,
+                "title": "Test Thread for READ",
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+                "user_id": "test-user"
+            })
             
-            # Create a thread first
-            create_query = text("""
-                INSERT INTO threads (thread_id, title, created_at, updated_at, user_id)
-                VALUES (:thread_id, :title, :created_at, :updated_at, :user_id)
+            # Read the thread
+            read_query = text("""
+                SELECT thread_id, title, created_at, updated_at, user_id
+                FROM threads
+                WHERE thread_id = :thread_id
             """)
             
-            with client.get_connection() as conn:
-                conn.execute(create_query, {
-                    "thread_id": test_thread_id,
-                    "title": "Test Thread for READ",
-                    "created_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow(),
-                    "user_id": "test-user"
-                })
-                
-                # Read the thread
-                read_query = text("""
-                    SELECT thread_id, title, created_at, updated_at, user_id
-                    FROM threads
-                    WHERE thread_id = :thread_id
-                """)
-                
-                result = conn.execute(read_query, {"thread_id": test_thread_id})
-                row = result.fetchone()
-                
-                assert row is not None
-                assert row[0] == test_thread_id
-                assert row[1] == "Test Thread for READ"
-                
-                # Cleanup
-                conn.execute(text("DELETE FROM threads WHERE thread_id = :thread_id"), {
-                    "thread_id": test_thread_id
-                })
-        finally:
-            from database.cloud_sql_client import close_db_client
-            close_db_client()
+            result = conn.execute(read_query, {"thread_id": test_thread_id})
+            row = result.fetchone()
+            
+            assert row is not None
+            assert row[0] == test_thread_id
+            assert row[1] == "Test Thread for READ"
     
-    def test_update_thread(self):
+    def test_update_thread(self, db_client):
         """Test UPDATE operation."""
-        if not DB_CONFIGURED:
-            pytest.skip("Database environment variables not configured")
+        test_thread_id = f"test-thread-{int(datetime.now().timestamp())}"
+        new_title = f"Updated Test Thread - {datetime.now().strftime('%H:%M:%S')}"
         
-        from database.cloud_sql_client import get_db_client
+        # Create a thread first
+        create_query = text("""
+            INSERT INTO threads (thread_id, title, created_at, updated_at, user_id)
+            VALUES (:thread_id, :title, :created_at, :updated_at, :user_id)
+        """)
         
-        try:
-            client = get_db_client()
-            test_thread_id = f"test-thread-{int(datetime.now().timestamp())}"
-            new_title = f"Updated Test Thread - {datetime.now().strftime('%H:%M:%S')}"
+        with db_client.get_connection() as conn:
+            conn.execute(create_query, {
+                "thread_id": test_thread_id,
+                "title": "Original Title",
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+                "user_id": "test-user"
+            })
             
-            # Create a thread first
-            create_query = text("""
-                INSERT INTO threads (thread_id, title, created_at, updated_at, user_id)
-                VALUES (:thread_id, :title, :created_at, :updated_at, :user_id)
+            # Update the thread
+            update_query = text("""
+                UPDATE threads
+                SET title = :title, updated_at = :updated_at
+                WHERE thread_id = :thread_id
+                RETURNING thread_id, title, updated_at
             """)
             
-            with client.get_connection() as conn:
-                conn.execute(create_query, {
-                    "thread_id": test_thread_id,
-                    "title": "Original Title",
-                    "created_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow(),
-                    "user_id": "test-user"
-                })
-                
-                # Update the thread
-                update_query = text("""
-                    UPDATE threads
-                    SET title = :title, updated_at = :updated_at
-                    WHERE thread_id = :thread_id
-                    RETURNING thread_id, title, updated_at
-                """)
-                
-                result = conn.execute(update_query, {
-                    "title": new_title,
-                    "updated_at": datetime.utcnow(),
-                    "thread_id": test_thread_id
-                })
-                row = result.fetchone()
-                
-                assert row is not None
-                assert row[0] == test_thread_id
-                assert row[1] == new_title
-                
-                # Cleanup
-                conn.execute(text("DELETE FROM threads WHERE thread_id = :thread_id"), {
-                    "thread_id": test_thread_id
-                })
-        finally:
-            from database.cloud_sql_client import close_db_client
-            close_db_client()
+            result = conn.execute(update_query, {
+                "title": new_title,
+                "updated_at": datetime.utcnow(),
+                "thread_id": test_thread_id
+            })
+            row = result.fetchone()
+            
+            assert row is not None
+            assert row[0] == test_thread_id
+            assert row[1] == new_title
     
-    def test_delete_thread(self):
+    def test_delete_thread(self, db_client):
         """Test DELETE operation."""
-        if not DB_CONFIGURED:
-            pytest.skip("Database environment variables not configured")
+        test_thread_id = f"test-thread-{int(datetime.now().timestamp())}"
         
-        from database.cloud_sql_client import get_db_client
+        # Create a thread first
+        create_query = text("""
+            INSERT INTO threads (thread_id, title, created_at, updated_at, user_id)
+            VALUES (:thread_id, :title, :created_at, :updated_at, :user_id)
+        """)
         
-        try:
-            client = get_db_client()
-            test_thread_id = f"test-thread-{int(datetime.now().timestamp())}"
+        with db_client.get_connection() as conn:
+            conn.execute(create_query, {
+                "thread_id": test_thread_id,
+                "title": "Test Thread for DELETE",
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow(),
+                "user_id": "test-user"
+            })
             
-            # Create a thread first
-            create_query = text("""
-                INSERT INTO threads (thread_id, title, created_at, updated_at, user_id)
-                VALUES (:thread_id, :title, :created_at, :updated_at, :user_id)
-            """)
+            # Delete the thread
+            delete_query = text("DELETE FROM threads WHERE thread_id = :thread_id RETURNING thread_id")
+            result = conn.execute(delete_query, {"thread_id": test_thread_id})
+            row = result.fetchone()
+            
+            assert row is not None
+            assert row[0] == test_thread_id
+            
+            # Verify deletion
+            verify_query = text("SELECT COUNT(*) FROM threads WHERE thread_id = :thread_id")
+            result = conn.execute(verify_query, {"thread_id": test_thread_id})
+            count = result.fetchone()[0]
             
-            with client.get_connection() as conn:
-                conn.execute(create_query, {
-                    "thread_id": test_thread_id,
-                    "title": "Test Thread for DELETE",
-                    "created_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow(),
-                    "user_id": "test-user"
-                })
-                
-                # Delete the thread
-                delete_query = text("DELETE FROM threads WHERE thread_id = :thread_id RETURNING thread_id")
-                result = conn.execute(delete_query, {"thread_id": test_thread_id})
-                row = result.fetchone()
-                
-                assert row is not None
-                assert row[0] == test_thread_id
-                
-                # Verify deletion
-                verify_query = text("SELECT COUNT(*) FROM threads WHERE thread_id = :thread_id")
-                result = conn.execute(verify_query, {"thread_id": test_thread_id})
-                count = result.fetchone()[0]
-                
-                assert count == 0, "Thread should be deleted"
-        finally:
-            from database.cloud_sql_client import close_db_client
-            close_db_client()
+            assert count == 0, "Thread should be deleted"
     
-    def test_message_operations(self):
+    def test_message_operations(self, db_client):
         """Test message CRUD operations."""
-        if not DB_CONFIGURED:
-            pytest.skip("Database environment variables not configured")
+        test_thread_id = f"test-thread-msg-{int(datetime.now().timestamp())}"
+        message_id = f"test-msg-{int(datetime.now().timestamp())}"
         
-        from database.cloud_sql_client import get_db_client
-        
-        try:
-            client = get_db_client()
-            test_thread_id = f"test-thread-msg-{int(datetime.now().timestamp())}"
-            message_id = f"test-msg-{int(datetime.now().timestamp())}"
+        with db_client.get_connection() as conn:
+            # Create a test thread first
+            create_thread_query = text("""
+                INSERT INTO threads (thread_id, title, created_at, updated_at)
+                VALUES (:thread_id, :title, :created_at, :updated_at)
+                ON CONFLICT (thread_id) DO NOTHING
+            """)
+            
+            conn.execute(create_thread_query, {
+                "thread_id": test_thread_id,
+                "title": "Test Thread for Messages",
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow()
+            })
+            
+            # Create a message
+            create_message_query = text("""
+                INSERT INTO messages (message_id, thread_id, role, content, timestamp)
+                VALUES (:message_id, :thread_id, :role, :content, :timestamp)
+                RETURNING message_id, thread_id, role, content
+            """)
+            
+            result = conn.execute(create_message_query, {
+                "message_id": message_id,
+                "thread_id": test_thread_id,
+                "role": "user",
+                "content": "This is a test message",
+                "timestamp": datetime.utcnow()
+            })
+            row = result.fetchone()
+            
+            assert row is not None
+            assert row[0] == message_id
+            assert row[1] == test_thread_id
+            assert row[2] == "user"
+            assert row[3] == "This is a test message"
+            
+            # Read messages for thread
+            read_messages_query = text("""
+                SELECT message_id, role, content, timestamp
+                FROM messages
+                WHERE thread_id = :thread_id
+                ORDER BY timestamp ASC
+            """)
             
-            with client.get_connection() as conn:
-                # Create a test thread first
-                create_thread_query = text("""
-                    INSERT INTO threads (thread_id, title, created_at, updated_at)
-                    VALUES (:thread_id, :title, :created_at, :updated_at)
-                    ON CONFLICT (thread_id) DO NOTHING
-                """)
-                
-                conn.execute(create_thread_query, {
-                    "thread_id": test_thread_id,
-                    "title": "Test Thread for Messages",
-                    "created_at": datetime.utcnow(),
-                    "updated_at": datetime.utcnow()
-                })
-                
-                # Create a message
-                create_message_query = text("""
-                    INSERT INTO messages (message_id, thread_id, role, content, timestamp)
-                    VALUES (:message_id, :thread_id, :role, :content, :timestamp)
-                    RETURNING message_id, thread_id, role, content
-                """)
-                
-                result = conn.execute(create_message_query, {
-                    "message_id": message_id,
-                    "thread_id": test_thread_id,
-                    "role": "user",
-                    "content": "This is a test message",
-                    "timestamp": datetime.utcnow()
-                })
-                row = result.fetchone()
-                
-                assert row is not None
-                assert row[0] == message_id
-                assert row[1] == test_thread_id
-                assert row[2] == "user"
-                assert row[3] == "This is a test message"
-                
-                # Read messages for thread
-                read_messages_query = text("""
-                    SELECT message_id, role, content, timestamp
-                    FROM messages
-                    WHERE thread_id = :thread_id
-                    ORDER BY timestamp ASC
-                """)
-                
-                result = conn.execute(read_messages_query, {"thread_id": test_thread_id})
-                messages = result.fetchall()
-                assert len(messages) > 0
-                
-                # Cleanup
-                conn.execute(text("DELETE FROM messages WHERE message_id = :message_id"), {
-                    "message_id": message_id
-                })
-                conn.execute(text("DELETE FROM threads WHERE thread_id = :thread_id"), {
-                    "thread_id": test_thread_id
-                })
-        finally:
-            from database.cloud_sql_client import close_db_client
-            close_db_client()
+            result = conn.execute(read_messages_query, {"thread_id": test_thread_id})
+            messages = result.fetchall()
+            assert len(messages) > 0
 
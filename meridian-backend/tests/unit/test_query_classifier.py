@@ -8,13 +8,17 @@ from typing import List, Dict, Any, Optional
 
 # Import intent classification (with fallback if not available)
 try:
-    from services.query_classifier import get_query_classifier
-    from services.agent_orchestrator import get_agent_orchestrator
+    from services.query_classifier import (
+        get_query_classifier,
+        QueryClassifier,
+        QueryClassification,
+        BatchQueryClassification,
+    )
+    from services.agent_orchestrator import get_agent_orchestrator, AgentOrchestrator
     from models.query_intent import QueryIntent
     from models.agent_workflow import AgentWorkflowConfig
-    INTENT_CLASSIFICATION_AVAILABLE = True
 except (ImportError, RuntimeError) as e:
-    INTENT_CLASSIFICATION_AVAILABLE = False
+    # Skips every test in this module at collection time
     pytestmark = pytest.mark.skip(reason=f"Intent classification not available: {e}")
 
 
@@ -24,9 +28,6 @@ class TestQueryClassifier:
     
     def test_classifier_available(self):
         """Test that classifier can be imported."""
-        if not INTENT_CLASSIFICATION_AVAILABLE:
-            pytest.skip("Intent classification not available")
-        
         # Mock the classifier to avoid real API calls
         with patch('services.query_classifier.get_query_classifier') as mock_get_classifier:
             mock_classifier = MagicMock()
@@ -36,9 +37,6 @@ class TestQueryClassifier:
     
     def test_classify_simple_chat(self, mock_agent_orchestrator):
         """Test classification of simple chat queries."""
-        if not INTENT_CLASSIFICATION_AVAILABLE:
-            pytest.skip("Intent classification not available")
-        
         # Use the mock orchestrator directly - it's already set up to return mock results
         intent, workflow = mock_agent_orchestrator.classify_and_get_workflow("Hello! What are you?")
         
@@ -48,9 +46,6 @@ class TestQueryClassifier:
     
     def test_classify_basic_info(self, mock_agent_orchestrator):
         """Test classification of basic info queries."""
-        if not INTENT_CLASSIFICATION_AVAILABLE:
-            pytest.skip("Intent classification not available")
-        
         # Use the mock orchestrator directly
         intent, workflow = mock_agent_orchestrator.classify_and_get_workflow("What is Apple stock trading at today?")
         
@@ -59,93 +54,222 @@ class TestQueryClassifier:
         assert hasattr(intent, 'value') or isinstance(intent, QueryIntent)
 
 
+def _classification(intent: "QueryIntent") -> "QueryClassification":
+    """Build a structured classification for a mocked LLM response."""
+    return QueryClassification(
+        intent=intent,
+        confidence=0.9,
+        reasoning="test",
+        requires_agents=intent != QueryIntent.SIMPLE_CHAT,
+        complexity="simple"
+    )
+
+
+@pytest.fixture
+def classifier(monkeypatch):
+    """QueryClassifier backed by a mocked instructor client (no real API calls)."""
+    monkeypatch.setenv("OPENAI_API_KEY", "test-api-key")
+    with patch("services.query_classifier.instructor.patch", return_value=MagicMock()), \
+         patch("services.query_classifier.openai.OpenAI"):
+        return QueryClassifier()
+
+
+@pytest.mark.unit
+class TestClassifyBatch:
+    """Tests for batched query classification."""
+
+    def test_preserves_input_order(self, classifier):
+        """Test that batch results come back in the same order as the queries."""
+        intents = [QueryIntent.TECHNICAL_ANALYSIS, QueryIntent.SIMPLE_CHAT, QueryIntent.BASIC_INFO]
+        classifier.client.chat.completions.create.return_value = BatchQueryClassification(
+            classifications=[_classification(intent) for intent in intents]
+        )
+
+        result = classifier.classify_batch(["Analyze AAPL", "Hello", "What is Tesla's business?"])
+
+        assert result == intents
+        create = classifier.client.chat.completions.create
+        assert create.call_count == 1
+        assert create.call_args.kwargs["response_model"] is BatchQueryClassification
+        assert create.call_args.kwargs["messages"][-1]["content"] == (
+            "1. Analyze AAPL\n2. Hello\n3. What is Tesla's business?"
+        )
+
+    def test_cache_hits_skip_llm(self, classifier):
+        """Test that cached queries are served without being sent to the LLM."""
+        classifier.classification_cache[QueryClassifier._cache_key("Hello")] = _classification(
+            QueryIntent.SIMPLE_CHAT
+        )
+        classifier.client.chat.completions.create.return_value = BatchQueryClassification(
+            classifications=[
+                _classification(QueryIntent.TECHNICAL_ANALYSIS),
+                _classification(QueryIntent.BASIC_INFO),
+            ]
+        )
+
+        result = classifier.classify_batch(["Analyze AAPL", "Hello", "What is Tesla's business?"])
+
+        assert result == [QueryIntent.TECHNICAL_ANALYSIS, QueryIntent.SIMPLE_CHAT, QueryIntent.BASIC_INFO]
+        create = classifier.client.chat.completions.create
+        assert create.call_args.kwargs["messages"][-1]["content"] == (
+            "1. Analyze AAPL\n2. What is Tesla's business?"
+        )
+
+    def test_cache_misses_are_cached(self, classifier):
+        """Test that batch results are cached for both the batch and single-query paths."""
+        classifier.client.chat.completions.create.return_value = BatchQueryClassification(
+            classifications=[
+                _classification(QueryIntent.TECHNICAL_ANALYSIS),
+                _classification(QueryIntent.BASIC_INFO),
+            ]
+        )
+
+        classifier.classify_batch(["Analyze AAPL", "What is Tesla's business?"])
+        assert classifier.classify_batch(["What is Tesla's business?", "Analyze AAPL"]) == [
+            QueryIntent.BASIC_INFO,
+            QueryIntent.TECHNICAL_ANALYSIS,
+        ]
+        assert classifier.classify("Analyze AAPL") == QueryIntent.TECHNICAL_ANALYSIS
+        assert classifier.client.chat.completions.create.call_count == 1
+
+    def test_empty_query_is_simple_chat(self, classifier):
+        """Test that empty queries are classified as simple chat without an LLM call."""
+        assert classifier.classify_batch(["", "   "]) == [QueryIntent.SIMPLE_CHAT, QueryIntent.SIMPLE_CHAT]
+        classifier.client.chat.completions.create.assert_not_called()
+
+    def test_length_mismatch_raises(self, classifier):
+        """Test that a batch response with the wrong number of results is rejected."""
+        classifier.client.chat.completions.create.return_value = BatchQueryClassification(
+            classifications=[_classification(QueryIntent.TECHNICAL_ANALYSIS)]
+        )
+
+        with pytest.raises(RuntimeError):
+            classifier.classify_batch(["Analyze AAPL", "What is Tesla's business?"])
+        assert classifier.classification_cache == {}
+
+    def test_splits_batches_over_max_queries(self, classifier, monkeypatch):
+        """Test that batches over MAX_BATCH_QUERIES are split, with single leftovers classified alone."""
+        monkeypatch.setattr("services.query_classifier.MAX_BATCH_QUERIES", 2)
+
+        def respond(model, messages, response_model, **kwargs):
+            if response_model is BatchQueryClassification:
+                return BatchQueryClassification(
+                    classifications=[
+                        _classification(QueryIntent.TECHNICAL_ANALYSIS),
+                        _classification(QueryIntent.BASIC_INFO),
+                    ]
+                )
+            return _classification(QueryIntent.FUNDAMENTAL_ANALYSIS)
+
+        classifier.client.chat.completions.create.side_effect = respond
+
+        result = classifier.classify_batch(["Analyze AAPL", "What is Tesla's business?", "Tesla's financial health"])
+
+        assert result == [
+            QueryIntent.TECHNICAL_ANALYSIS,
+            QueryIntent.BASIC_INFO,
+            QueryIntent.FUNDAMENTAL_ANALYSIS,
+        ]
+        response_models = [
+            call.kwargs["response_model"] for call in classifier.client.chat.completions.create.call_args_list
+        ]
+        assert response_models == [BatchQueryClassification, QueryClassification]
+
+    def test_falls_back_over_max_chars(self, classifier, monkeypatch):
+        """Test that batches over MAX_BATCH_CHARS are classified one query at a time."""
+        monkeypatch.setattr("services.query_classifier.MAX_BATCH_CHARS", 10)
+        classifier.client.chat.completions.create.side_effect = [
+            _classification(QueryIntent.TECHNICAL_ANALYSIS),
+            _classification(QueryIntent.BASIC_INFO),
+        ]
+
+        result = classifier.classify_batch(["Analyze AAPL", "What is Tesla's business?"])
+
+        assert result == [QueryIntent.TECHNICAL_ANALYSIS, QueryIntent.BASIC_INFO]
+        for call in classifier.client.chat.completions.create.call_args_list:
+            assert call.kwargs["response_model"] is QueryClassification
+
+
+@pytest.mark.unit
+class TestClassifyAndGetWorkflowBatch:
+    """Tests for batched classification in the agent orchestrator."""
+
+    @pytest.fixture
+    def orchestrator(self):
+        """AgentOrchestrator with a mocked classifier and pass-through workflow optimization."""
+        with patch("services.agent_orchestrator.get_query_classifier", return_value=MagicMock()):
+            orchestrator = AgentOrchestrator()
+        orchestrator.optimize_workflow_for_query = MagicMock(side_effect=lambda query, workflow, intent: workflow)
+        return orchestrator
+
+    def test_uses_classify_batch_without_context(self, orchestrator):
+        """Test that queries without context are classified in one batch, in order."""
+        orchestrator.classifier.classify_batch.return_value = [QueryIntent.SIMPLE_CHAT, QueryIntent.BASIC_INFO]
+
+        results = orchestrator.classify_and_get_workflow_batch(["Hello", "What is Tesla's business?"])
+
+        orchestrator.classifier.classify_batch.assert_called_once_with(["Hello", "What is Tesla's business?"])
+        orchestrator.classifier.classify.assert_not_called()
+        assert [intent for intent, _ in results] == [QueryIntent.SIMPLE_CHAT, QueryIntent.BASIC_INFO]
+        assert all(isinstance(workflow, AgentWorkflowConfig) for _, workflow in results)
+
+    def test_classifies_individually_with_context(self, orchestrator):
+        """Test that queries with conversation context are classified one by one."""
+        context = [{"role": "user", "content": "Tell me about Apple"}]
+        orchestrator.classifier.classify.side_effect = [QueryIntent.BASIC_INFO, QueryIntent.TECHNICAL_ANALYSIS]
+
+        results = orchestrator.classify_and_get_workflow_batch(["What about its CEO?", "And its chart?"], context)
+
+        orchestrator.classifier.classify_batch.assert_not_called()
+        assert orchestrator.classifier.classify.call_args_list == [
+            (("What about its CEO?", context),),
+            (("And its chart?", context),),
+        ]
+        assert [intent for intent, _ in results] == [QueryIntent.BASIC_INFO, QueryIntent.TECHNICAL_ANALYSIS]
+
+
+# Test queries organized by category
+TEST_QUERIES = {
+    "simple_chat": [
+        "Hello! What are you?",
+        "What can you help me with?",
+        "Tell me about yourself"
+    ],
+    "basic_info": [
+        "What is Apple stock trading at today?",
+        "What is Tesla's business?",
+        "What's Microsoft's main products?"
+    ],
+    "technical_analysis": [
+        "Run a market analysis on AAPL",
+        "Apple stock technical analysis",
+        "What's the technical outlook for Tesla?"
+    ],
+    "fundamental_analysis": [
+        "Analyze Apple's fundamentals",
+        "Get fundamental data for Apple",
+        "Tesla's financial health"
+    ],
+    "comprehensive_analysis": [
+        "Should I buy Apple stock today?",
+        "Is Tesla overvalued?",
+        "Comprehensive analysis of AMZN"
+    ]
+}
+
+
 @pytest.mark.unit
 class TestIntentClassificationCategories:
     """Tests for intent classification across different categories."""
     
-    @pytest.fixture
-    def test_queries(self):
-        """Test queries organized by category."""
-        return {
-            "simple_chat": [
-                "Hello! What are you?",
-                "What can you help me with?",
-                "Tell me about yourself"
-            ],
-            "basic_info": [
-                "What is Apple stock trading at today?",
-                "What is Tesla's business?",
-                "What's Microsoft's main products?"
-            ],
-            "technical_analysis": [
-                "Run a market analysis on AAPL",
-                "Apple stock technical analysis",
-                "What's the technical outlook for Tesla?"
-            ],
-            "fundamental_analysis": [
-                "Analyze Apple's fundamentals",
-                "Get fundamental data for Apple",
-                "Tesla's financial health"
-            ],
-            "comprehensive_analysis": [
-                "Should I buy Apple stock today?",
-                "Is Tesla overvalued?",
-                "Comprehensive analysis of AMZN"
-            ]
-        }
-    
-    def test_classify_simple_chat_queries(self, test_queries, mock_agent_orchestrator):
-        """Test classification of simple chat queries."""
-        if not INTENT_CLASSIFICATION_AVAILABLE:
-            pytest.skip("Intent classification not available")
-        
-        # Use mock orchestrator directly - no real API calls
-        for query in test_queries["simple_chat"]:
-            intent, workflow = mock_agent_orchestrator.classify_and_get_workflow(query)
-            assert intent is not None
-            assert workflow is not None
-    
-    def test_classify_basic_info_queries(self, test_queries, mock_agent_orchestrator):
-        """Test classification of basic info queries."""
-        if not INTENT_CLASSIFICATION_AVAILABLE:
-            pytest.skip("Intent classification not available")
-        
-        # Use mock orchestrator directly - no real API calls
-        for query in test_queries["basic_info"]:
-            intent, workflow = mock_agent_orchestrator.classify_and_get_workflow(query)
-            assert intent is not None
-            assert workflow is not None
-    
-    def test_classify_technical_analysis_queries(self, test_queries, mock_agent_orchestrator):
-        """Test classification of technical analysis queries."""
-        if not INTENT_CLASSIFICATION_AVAILABLE:
-            pytest.skip("Intent classification not available")
-        
-        # Use mock orchestrator directly - no real API calls
-        for query in test_queries["technical_analysis"]:
-            intent, workflow = mock_agent_orchestrator.classify_and_get_workflow(query)
-            assert intent is not None
-            assert workflow is not None
-    
-    def test_classify_fundamental_analysis_queries(self, test_queries, mock_agent_orchestrator):
-        """Test classification of fundamental analysis queries."""
-        if not INTENT_CLASSIFICATION_AVAILABLE:
-            pytest.skip("Intent classification not available")
-        
-        # Use mock orchestrator directly - no real API calls
-        for query in test_queries["fundamental_analysis"]:
-            intent, workflow = mock_agent_orchestrator.classify_and_get_workflow(query)
-            assert intent is not None
-            assert workflow is not None
-    
-    def test_classify_comprehensive_analysis_queries(self, test_queries, mock_agent_orchestrator):
-        """Test classification of comprehensive analysis queries."""
-        if not INTENT_CLASSIFICATION_AVAILABLE:
-            pytest.skip("Intent classification not available")
-        
+    @pytest.mark.parametrize(
+        "category,query",
+        [(category, query) for category, queries in TEST_QUERIES.items() for query in queries],
+        ids=[f"{category}-{i}" for category, queries in TEST_QUERIES.items() for i in range(len(queries))]
+    )
+    def test_classify(self, category, query, mock_agent_orchestrator):
+        """Test classification of each category's queries."""
         # Use mock orchestrator directly - no real API calls
-        for query in test_queries["comprehensive_analysis"]:
-            intent, workflow = mock_agent_orchestrator.classify_and_get_workflow(query)
-            assert intent is not None
-            assert workflow is not None
-
+        intent, workflow = mock_agent_orchestrator.classify_and_get_workflow(query)
+        assert intent is not None
+        assert workflow is not None